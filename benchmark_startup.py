@@ -0,0 +1,53 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 50))
+RUNS = 5
+HEAVY_MODULES = ['requests', 'telegram']
+IMPORT_TIME = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| homework$')
+REPORT = 'Импорт homework: {time:.1f} мс (бюджет {budget:.0f} мс)'
+HEAVY_IMPORTED = 'При импорте homework загружены модули: {names}'
+CHECK_HEAVY = (
+    'import sys, homework; '
+    'print(",".join(name for name in {names} if name in sys.modules))'
+)
+
+
+def import_time():
+    """Время импорта homework в миллисекундах по -X importtime."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import homework'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            return int(match.group(1)) / 1000
+
+
+def heavy_imported():
+    """Тяжёлые модули, загруженные при импорте homework."""
+    result = subprocess.run(
+        [sys.executable, '-c', CHECK_HEAVY.format(names=HEAVY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def main():
+    """Проверка времени холодного старта; код 1 при превышении бюджета."""
+    median = statistics.median(import_time() for _ in range(RUNS))
+    print(REPORT.format(time=median, budget=STARTUP_BUDGET_MS))
+    heavy = heavy_imported()
+    if heavy:
+        print(HEAVY_IMPORTED.format(names=heavy))
+    return int(median > STARTUP_BUDGET_MS or bool(heavy))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
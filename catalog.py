@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_SIZE = 4096
+CATALOG_INVALID = 'Некорректный каталог сообщений: {entry}'
+
+
+def escape(text):
+    """Текст, безопасный для подстановки в шаблон str.format."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+class Renderer:
+    """Шаблоны сообщений одного каталога с уже подставленными вердиктами."""
+
+    def __init__(self, template, verdicts, unknown):
+        self.unknown = unknown
+        self.verdicts = verdicts
+        self.compiled = {
+            status: template.replace('{status}', escape(verdict))
+            for status, verdict in verdicts.items()
+        }
+
+    def render(self, name, status):
+        """Сообщение о смене статуса; неизвестный статус не ошибка."""
+        if status in self.compiled:
+            return self.compiled[status].format(name=name)
+        return self.unknown.format(name=name, status=status)
+
+    def check(self):
+        """Пробная подстановка во все шаблоны; ошибка — ValueError."""
+        for status in list(self.compiled) + [None]:
+            try:
+                self.render('', status)
+            except (KeyError, IndexError, ValueError) as error:
+                raise ValueError(CATALOG_INVALID.format(
+                    entry=f'{status}: {error!r}'
+                ))
+
+
+def check_entry(entry, fields):
+    """Запись каталога — объект, а её поля fields нужного типа."""
+    if not isinstance(entry, dict) or any(
+        name in entry and not isinstance(entry[name], kind)
+        for name, kind in fields.items()
+    ) or not all(
+        isinstance(verdict, str)
+        for verdict in entry.get('verdicts', {}).values()
+    ):
+        raise ValueError(CATALOG_INVALID.format(entry=entry))
+    return entry
+
+
+LOCALE_FIELDS = dict(template=str, verdicts=dict, unknown=str)
+CHAT_FIELDS = dict(LOCALE_FIELDS, locale=(str, type(None)))
+
+
+class Catalog:
+    """Каталоги сообщений: языки и вердикты, переопределённые для чатов.
+    Файл path читается один раз (и заново при load()), каждый каталог
+    компилируется в Renderer, а готовые сообщения кэшируются по
+    (каталог, статус, название работы) с вытеснением самых старых.
+    Формат файла:
+    {"locales": {"en": {"template": "...", "verdicts": {...},
+                        "unknown": "..."}},
+     "chats": {"123": {"locale": "en", "verdicts": {...}}}}
+    """
+
+    def __init__(self, template, verdicts, unknown, path=None,
+                 cache_size=CACHE_SIZE):
+        self.base = dict(template=template, verdicts=verdicts,
+                         unknown=unknown)
+        self.path = path
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.renderers = None
+        self.chats = {}
+
+    def load(self):
+        """Чтение и компиляция каталогов; при ошибке остаются прежние.
+        Файл неверной структуры — ValueError.
+        """
+        data = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        check_entry(data, dict(locales=dict, chats=dict))
+        locales = {None: self.base}
+        for locale, entry in data.get('locales', {}).items():
+            locales[locale] = dict(
+                self.base, **check_entry(entry, LOCALE_FIELDS)
+            )
+        renderers = {}
+        for locale, entry in locales.items():
+            renderers[locale] = Renderer(
+                entry['template'], entry['verdicts'], entry['unknown']
+            )
+        chats = {}
+        for chat_id, entry in data.get('chats', {}).items():
+            locale = check_entry(entry, CHAT_FIELDS).get('locale')
+            if locale not in locales or not chat_id.lstrip('-').isdigit():
+                raise ValueError(CATALOG_INVALID.format(entry={
+                    chat_id: entry
+                }))
+            if 'verdicts' not in entry and 'template' not in entry:
+                chats[int(chat_id)] = locale
+                continue
+            key = f'{locale}:{chat_id}'
+            merged = dict(locales[locale])
+            merged['template'] = entry.get('template', merged['template'])
+            merged['verdicts'] = dict(
+                merged['verdicts'], **entry.get('verdicts', {})
+            )
+            renderers[key] = Renderer(
+                merged['template'], merged['verdicts'], merged['unknown']
+            )
+            chats[int(chat_id)] = key
+        for renderer in renderers.values():
+            renderer.check()
+        with self.lock:
+            self.renderers = renderers
+            self.chats = chats
+            self.cache.clear()
+
+    def renderer(self, chat_id):
+        """Каталог, по которому пишутся сообщения для чата."""
+        if self.renderers is None:
+            self.load()
+        with self.lock:
+            return self.renderers[self.chats.get(chat_id)]
+
+    def verdict(self, chat_id, status):
+        """Вердикт по статусу на языке чата; неизвестный — сам статус."""
+        return self.renderer(chat_id).verdicts.get(status, status)
+
+    def render(self, chat_id, homework):
+        """Сообщение о смене статуса домашки для чата."""
+        if self.renderers is None:
+            self.load()
+        with self.lock:
+            key = (self.chats.get(chat_id), homework['status'],
+                   homework['homework_name'])
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            renderers = self.renderers
+        message = renderers[key[0]].render(key[2], key[1])
+        with self.lock:
+            if renderers is not self.renderers:
+                return message
+            self.cache[key] = message
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return message
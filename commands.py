@@ -0,0 +1,98 @@
+import time
+
+TIME_FORMAT = '%d.%m.%Y %H:%M:%S'
+FRESHNESS = 'Данные на {time} (опрос API {age} с назад).'
+NO_DATA = 'Статусы ещё не получены, дождитесь опроса API.'
+STATUS_LINE = '"{name}": {verdict}'
+HISTORY_LINE = '{time} "{name}": {status}'
+HISTORY_EMPTY = 'Изменений статусов пока не было.'
+PAUSED = 'Уведомления приостановлены, /pause — возобновить.'
+RESUMED = 'Уведомления возобновлены.'
+HISTORY_SIZE = 10
+
+
+def format_time(timestamp):
+    """Время в читаемом виде."""
+    return time.strftime(TIME_FORMAT, time.localtime(timestamp))
+
+
+def freshness(state):
+    """Отметка о том, насколько свежи данные."""
+    return FRESHNESS.format(
+        time=format_time(state.updated_at),
+        age=int(time.time() - state.updated_at)
+    )
+
+
+def get_state(update, context):
+    """Состояние опроса для чата, из которого пришла команда."""
+    return context.bot_data['states'].get(update.effective_chat.id)
+
+
+def status(update, context):
+    """Команда /status: текущие статусы из последнего опроса."""
+    state = get_state(update, context)
+    if state is None:
+        return
+    with state.lock:
+        if state.updated_at is None or not state.homeworks:
+            lines = [NO_DATA]
+        else:
+            catalog = context.bot_data['catalog']
+            lines = [
+                STATUS_LINE.format(
+                    name=name,
+                    verdict=catalog.verdict(state.tenant, homework['status'])
+                )
+                for name, homework in state.homeworks.items()
+            ]
+        if state.updated_at is not None:
+            lines.append(freshness(state))
+    update.message.reply_text('\n'.join(lines))
+
+
+def history(update, context):
+    """Команда /history: последние изменения статусов."""
+    state = get_state(update, context)
+    if state is None:
+        return
+    with state.lock:
+        lines = [
+            HISTORY_LINE.format(
+                time=format_time(record['time']), name=record['name'],
+                status=record['status']
+            )
+            for record in state.history[-HISTORY_SIZE:]
+        ] or [HISTORY_EMPTY]
+        if state.updated_at is not None:
+            lines.append(freshness(state))
+    update.message.reply_text('\n'.join(lines))
+
+
+def pause(update, context):
+    """Команда /pause: приостановка или возобновление уведомлений."""
+    state = get_state(update, context)
+    if state is None:
+        return
+    update.message.reply_text(PAUSED if state.toggle_pause() else RESUMED)
+
+
+COMMANDS = {
+    'status': status,
+    'history': history,
+    'pause': pause,
+}
+
+
+def start_commands(token, states, catalog):
+    """Запуск обработки команд бота в фоновом потоке."""
+    from telegram.ext import CommandHandler, Updater
+
+    updater = Updater(token=token, use_context=True)
+    dispatcher = updater.dispatcher
+    dispatcher.bot_data['states'] = states
+    dispatcher.bot_data['catalog'] = catalog
+    for command, callback in COMMANDS.items():
+        dispatcher.add_handler(CommandHandler(command, callback))
+    updater.start_polling()
+    return updater
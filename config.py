@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+from dotenv import dotenv_values
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL = 5
+TENANT_INVALID = 'Некорректная запись о студенте: {tenant}'
+TENANTS_NOT_LIST = 'Реестр студентов должен быть списком, а не {type}'
+
+
+def read_settings(env_file, names, environ=os.environ):
+    """Настройки из файла .env; переменные окружения важнее."""
+    values = dict.fromkeys(names)
+    if env_file and os.path.exists(env_file):
+        values.update(
+            (name, value) for name, value in dotenv_values(env_file).items()
+            if name in names
+        )
+    values.update(
+        (name, environ[name]) for name in names if name in environ
+    )
+    return values
+
+
+def read_tenants(path):
+    """Реестр студентов: {chat_id: practicum_token}."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        tenants = json.load(file)
+    if not isinstance(tenants, list):
+        raise ValueError(TENANTS_NOT_LIST.format(type=type(tenants)))
+    registry = {}
+    for tenant in tenants:
+        token = tenant.get('practicum_token') if isinstance(
+            tenant, dict
+        ) else None
+        if not token or not isinstance(token, str) or 'chat_id' not in tenant:
+            raise ValueError(TENANT_INVALID.format(tenant=tenant))
+        registry[int(tenant['chat_id'])] = tenant['practicum_token']
+    return registry
+
+
+def write_tenants(path, registry):
+    """Атомарная запись реестра студентов."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(
+            [dict(chat_id=chat_id, practicum_token=token)
+             for chat_id, token in registry.items()],
+            file, indent=2
+        )
+    os.replace(temp_path, path)
+
+
+class ConfigWatcher:
+    """Сигнал о том, что файлы настроек пора перечитать.
+    Срабатывает по SIGHUP или когда у одного из файлов меняется время
+    изменения. Цикл опроса ждёт через wait(), поэтому перечитывание
+    происходит сразу, а не после очередного RETRY_TIME.
+    """
+
+    def __init__(self, paths, interval=WATCH_INTERVAL):
+        self.paths = [path for path in paths if path]
+        self.interval = interval
+        self.wakeup = threading.Event()
+        self.mtimes = self.snapshot()
+
+    def snapshot(self):
+        """Время изменения отслеживаемых файлов."""
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def install_signal(self):
+        """Перечитывание настроек по SIGHUP."""
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self.on_signal)
+
+    def on_signal(self, signum, frame):
+        """Обработчик сигнала: только будит цикл опроса."""
+        self.wakeup.set()
+
+    def start(self):
+        """Фоновая проверка файлов раз в interval секунд."""
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    def watch(self):
+        """Сравнение времени изменения файлов с последним прочитанным."""
+        while True:
+            time.sleep(self.interval)
+            if self.snapshot() != self.mtimes:
+                self.wakeup.set()
+
+    def wait(self, timeout):
+        """Ожидание; True, если настройки пора перечитать."""
+        if not self.wakeup.wait(timeout):
+            return False
+        self.wakeup.clear()
+        self.mtimes = self.snapshot()
+        return True
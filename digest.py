@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_LENGTH = 4096
+SEPARATOR = '\n\n'
+FLUSH_ERROR = 'Не удалось отправить сводку: {error}'
+QUEUE_LOAD_ERROR = 'Не удалось загрузить очередь сводки из {path}: {error}'
+QUEUE_SAVE_ERROR = 'Не удалось сохранить очередь сводки в {path}: {error}'
+
+
+def split_digest(messages, limit=MAX_MESSAGE_LENGTH):
+    """Склейка сообщений в части не длиннее limit."""
+    chunks = []
+    current = ''
+    for message in messages:
+        for start in range(0, len(message), limit):
+            part = message[start:start + limit]
+            if current and len(current) + len(SEPARATOR) + len(part) <= limit:
+                current += SEPARATOR + part
+                continue
+            if current:
+                chunks.append(current)
+            current = part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class Digest:
+    """Накопление уведомлений и отправка их одной сводкой.
+    Сводку отправляет flush(): цикл опроса вызывает его в конце каждой
+    итерации, а для событий вне цикла он срабатывает через window секунд
+    после первого накопленного сообщения. Трассировки сообщений
+    получают этапы queue и send_message и после доставки всей сводки
+    передаются в on_delivered.
+    Если задан path, неотправленные сообщения (и отправляемые прямо
+    сейчас) хранятся ещё и в файле: после перезапуска процесса они
+    уйдут при первом flush(), а не потеряются.
+    """
+
+    def __init__(self, send, window=0, on_delivered=None, path=None):
+        self.send = send
+        self.window = window
+        self.on_delivered = on_delivered
+        self.path = path
+        self.messages = []
+        self.sending = []
+        self.traces = []
+        self.lock = threading.Lock()
+        self.timer = None
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self):
+        """Чтение сохранённой очереди с диска."""
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                self.messages = json.load(file)
+        except (OSError, ValueError) as error:
+            logger.error(QUEUE_LOAD_ERROR.format(path=self.path, error=error))
+
+    def save(self):
+        """Атомарная запись очереди; вызывается под self.lock."""
+        if not self.path:
+            return
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(self.sending + self.messages, file,
+                          ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            logger.error(QUEUE_SAVE_ERROR.format(path=self.path, error=error))
+
+    def add(self, message, trace=None):
+        """Добавление сообщения в сводку."""
+        with self.lock:
+            self.messages.append(message)
+            self.save()
+            if trace is not None:
+                self.traces.append(trace)
+            if self.window and self.timer is None:
+                self.timer = threading.Timer(self.window, self.flush_quietly)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Отправка накопленного; неотправленное остаётся в очереди."""
+        with self.lock:
+            messages, self.messages = self.messages, []
+            traces, self.traces = self.traces, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            chunks = split_digest(messages)
+            self.sending = self.sending + chunks
+        sending = time.time()
+        for sent, chunk in enumerate(chunks):
+            try:
+                self.send(chunk)
+            except Exception:
+                with self.lock:
+                    self.remove_sending(chunks[sent:])
+                    self.messages[:0] = chunks[sent:]
+                    self.traces[:0] = traces
+                    self.save()
+                raise
+            with self.lock:
+                self.remove_sending([chunk])
+                self.save()
+        if traces:
+            delivered = time.time()
+            for trace in traces:
+                trace.span('queue', sending)
+                trace.span('send_message', delivered)
+            if self.on_delivered is not None:
+                self.on_delivered(traces)
+
+    def remove_sending(self, chunks):
+        """Снятие частей сводки с отправки."""
+        for chunk in chunks:
+            self.sending.remove(chunk)
+
+    def flush_quietly(self):
+        """Отправка по таймеру с записью ошибки в журнал."""
+        try:
+            self.flush()
+        except Exception as error:
+            logger.error(FLUSH_ERROR.format(error=error))
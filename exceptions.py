@@ -6,3 +6,8 @@ class InternalServerError(Exception):
 class BotSendMessageError(Exception):
     """Ошибка отправки сообщения ботом."""
     pass
+
+
+class TemporaryAPIError(ConnectionError):
+    """Временная недоступность API: сеть, 429 или ответ 5xx."""
+    pass
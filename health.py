@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 5
+DEFAULT_HOST = '127.0.0.1'
+STALLED = 'Зависание {name}: нет прогресса {seconds:.0f} с\n{stacks}'
+RESTARTING = 'Перезапуск процесса из-за зависания {names}'
+THREAD_STACK = 'Поток {name}:\n{stack}'
+
+
+def thread_stacks():
+    """Стеки всех потоков процесса."""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    return '\n'.join(
+        THREAD_STACK.format(
+            name=names.get(ident, ident),
+            stack=''.join(traceback.format_stack(frame))
+        )
+        for ident, frame in sys._current_frames().items()
+    )
+
+
+class Watchdog:
+    """Слежение за прогрессом опроса API и отправки сообщений.
+    Компонент считается зависшим, если начатая им операция длится
+    дольше threshold секунд. Зависание пишется в журнал со стеками
+    потоков, а при restart процесс перезапускается: состояние чатов
+    и очереди сводок сохранены на диске, а зависший поток иначе не
+    остановить.
+    """
+
+    def __init__(self, threshold, restart=False):
+        self.threshold = threshold
+        self.restart = restart
+        self.lock = threading.Lock()
+        self.started = {}
+        self.progress = {}
+        self.reported = set()
+        self.ready = False
+
+    @contextmanager
+    def track(self, name):
+        """Контекст операции компонента; операции могут идти параллельно."""
+        operation = object()
+        with self.lock:
+            self.started.setdefault(name, {})[operation] = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.lock:
+                operations = self.started[name]
+                del operations[operation]
+                if not operations:
+                    del self.started[name]
+                    self.reported.discard(name)
+                self.progress[name] = time.monotonic()
+
+    def stalled(self):
+        """Зависшие компоненты и длительность их самых долгих операций."""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                name: now - min(operations.values())
+                for name, operations in self.started.items()
+                if now - min(operations.values()) > self.threshold
+            }
+
+    def status(self):
+        """Состояние компонентов для проверок живости и готовности."""
+        now = time.monotonic()
+        stalled = self.stalled()
+        with self.lock:
+            progress = {
+                name: round(now - moment, 1)
+                for name, moment in self.progress.items()
+            }
+        return dict(
+            alive=not stalled, ready=self.ready and not stalled,
+            stalled={name: round(age, 1) for name, age in stalled.items()},
+            last_progress=progress,
+        )
+
+    def check(self):
+        """Журналирование новых зависаний и перезапуск при необходимости."""
+        stalled = self.stalled()
+        with self.lock:
+            new = set(stalled) - self.reported
+            self.reported |= new
+        if new:
+            stacks = thread_stacks()
+            for name in new:
+                logger.error(STALLED.format(
+                    name=name, seconds=stalled[name], stacks=stacks
+                ))
+        if stalled and self.restart:
+            logger.critical(RESTARTING.format(names=sorted(stalled)))
+            logging.shutdown()
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    def start(self):
+        """Фоновая проверка раз в CHECK_INTERVAL секунд."""
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    def watch(self):
+        """Цикл фоновой проверки."""
+        while True:
+            time.sleep(CHECK_INTERVAL)
+            self.check()
+
+
+def start_health_server(port, watchdog, host=DEFAULT_HOST):
+    """HTTP-проверки /healthz (живость) и /readyz (готовность)."""
+    from http import HTTPStatus
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        """Ответ состоянием Watchdog в JSON."""
+
+        def do_GET(self):
+            """200, если проверка пройдена, иначе 503."""
+            checks = {'/healthz': 'alive', '/readyz': 'ready'}
+            if self.path not in checks:
+                self.send_response(HTTPStatus.NOT_FOUND)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = watchdog.status()
+            body = json.dumps(status).encode()
+            self.send_response(
+                HTTPStatus.OK if status[checks[self.path]]
+                else HTTPStatus.SERVICE_UNAVAILABLE
+            )
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Журнал запросов через logging вместо stderr."""
+            logger.debug(format, *args)
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
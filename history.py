@@ -0,0 +1,268 @@
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Чат, id домашки, время (секунды), код статуса.
+RECORD = struct.Struct('<qqIB')
+COUNT = struct.Struct('<Q')
+STATUSES = ['unknown', 'reviewing', 'approved', 'rejected']
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+COMPACT_TAIL = 4096
+COMPACT_INTERVAL = 60
+COMPACTED = 'Журнал {path} сжат: {before} -> {after} записей'
+COMPACT_ERROR = 'Не удалось сжать журнал {path}: {error}'
+
+
+def homework_id(homework):
+    """Числовой id домашки; для ответов без id — хэш названия."""
+    if 'id' in homework:
+        return int(homework['id'])
+    return zlib.crc32(homework['homework_name'].encode())
+
+
+def homework_time(homework, default):
+    """Время изменения статуса из date_updated."""
+    try:
+        return int(datetime.strptime(
+            homework['date_updated'], DATE_FORMAT
+        ).replace(tzinfo=timezone.utc).timestamp())
+    except (KeyError, TypeError, ValueError):
+        return int(default)
+
+
+def read_records(data, start, stop):
+    """Записи с номерами [start, stop) из буфера."""
+    return [
+        RECORD.unpack_from(data, number * RECORD.size)
+        for number in range(start, stop)
+    ]
+
+
+def lower_bound(data, count, key):
+    """Номер первой из count отсортированных записей, не меньшей key."""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if RECORD.unpack_from(data, middle * RECORD.size)[:len(key)] < key:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def same_status(first, second):
+    """Две записи об одном статусе одной домашки."""
+    if first is None or second is None:
+        return False
+    return first[:2] == second[:2] and first[3] == second[3]
+
+
+class HistoryLog:
+    """Журнал смен статусов с выборкой по домашке за O(log n).
+    В двоичный файл из записей фиксированного размера только дописывают.
+    Сжатие сортирует записи по (чат, домашка, время), убирает повторы
+    статусов и сохраняет число отсортированных записей в файле .idx.
+    Отсортированная часть журнала отображается в память и служит
+    индексом, а дописанный после сжатия хвост просматривается целиком.
+    Сжатие выполняет фоновый поток (start_compaction): сортируется только
+    хвост, а отсортированная часть копируется кусками между местами
+    вставки записей хвоста. Блокировка берётся лишь на подмену файла.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.lock = threading.Lock()
+        self.compacting = threading.Lock()
+
+    def append(self, tenant, homework, status, timestamp):
+        """Дописывание записи о смене статуса."""
+        record = RECORD.pack(
+            tenant, homework, int(timestamp), STATUS_CODES.get(status, 0)
+        )
+        with self.lock, open(self.path, 'ab') as file:
+            file.write(record)
+
+    def start_compaction(self, interval=COMPACT_INTERVAL):
+        """Фоновое сжатие, когда хвост длиннее COMPACT_TAIL записей."""
+        threading.Thread(
+            target=self.compact_forever, args=(interval,), daemon=True
+        ).start()
+
+    def compact_forever(self, interval):
+        """Цикл фонового сжатия; ошибки только в журнал."""
+        while True:
+            time.sleep(interval)
+            if self.tail_size() <= COMPACT_TAIL:
+                continue
+            try:
+                self.compact()
+            except Exception as error:
+                logger.error(COMPACT_ERROR.format(path=self.path, error=error))
+
+    def sorted_count(self):
+        """Число отсортированных записей в начале журнала."""
+        try:
+            with open(self.index_path, 'rb') as file:
+                return COUNT.unpack(file.read(COUNT.size))[0]
+        except (OSError, struct.error):
+            return 0
+
+    def total_count(self):
+        """Число целых записей в журнале."""
+        try:
+            return os.path.getsize(self.path) // RECORD.size
+        except OSError:
+            return 0
+
+    def tail_size(self):
+        """Число записей, дописанных после последнего сжатия."""
+        return self.total_count() - self.sorted_count()
+
+    def records(self, tenant, homework, start=0, end=None):
+        """Записи (время, статус) по домашке за период, по времени."""
+        if end is None:
+            end = time.time()
+        with self.lock:
+            total = self.total_count()
+            if not total:
+                return []
+            with open(self.path, 'rb') as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                sorted_count = min(self.sorted_count(), total)
+                found = self.search(data, sorted_count, tenant, homework,
+                                    start, end)
+                found += [
+                    record
+                    for record in read_records(data, sorted_count, total)
+                    if record[:2] == (tenant, homework)
+                    and start <= record[2] <= end
+                ]
+        return sorted(
+            (timestamp, STATUSES[code])
+            for _, _, timestamp, code in found
+        )
+
+    @staticmethod
+    def search(data, count, tenant, homework, start, end):
+        """Двоичный поиск по отсортированной части журнала."""
+        found = []
+        for number in range(
+            lower_bound(data, count, (tenant, homework, start)), count
+        ):
+            record = RECORD.unpack_from(data, number * RECORD.size)
+            if record[:2] != (tenant, homework) or record[2] > end:
+                break
+            found.append(record)
+        return found
+
+    def compact(self):
+        """Слияние хвоста с отсортированной частью без повторов статусов."""
+        with self.compacting:
+            with self.lock:
+                total = self.total_count()
+                sorted_count = min(self.sorted_count(), total)
+            if total == sorted_count:
+                return
+            temp_path = self.path + '.tmp'
+            with open(self.path, 'rb') as source, mmap.mmap(
+                source.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data, open(temp_path, 'wb') as target:
+                merged = self.merge(data, sorted_count, total, target)
+            with self.lock:
+                appended = self.total_count()
+                with open(self.path, 'rb') as source, open(
+                    temp_path, 'ab'
+                ) as target:
+                    source.seek(total * RECORD.size)
+                    target.write(source.read(
+                        (appended - total) * RECORD.size
+                    ))
+                self.write_sorted_count(0)
+                os.replace(temp_path, self.path)
+                self.write_sorted_count(merged)
+        logger.info(COMPACTED.format(
+            path=self.path, before=total, after=merged
+        ))
+
+    @staticmethod
+    def merge(data, count, total, target):
+        """Запись в target отсортированной части со вставленным хвостом."""
+        size = RECORD.size
+        position = 0
+        written = 0
+        previous = None
+        for record in sorted(set(read_records(data, count, total))) + [None]:
+            insert = count if record is None else lower_bound(
+                data, count, record
+            )
+            if insert > position:
+                if same_status(
+                    previous, RECORD.unpack_from(data, position * size)
+                ):
+                    position += 1
+                target.write(data[position * size:insert * size])
+                written += insert - position
+                if insert > position:
+                    previous = RECORD.unpack_from(data, (insert - 1) * size)
+                position = insert
+            if record is None or same_status(previous, record) or (
+                position < count
+                and record == RECORD.unpack_from(data, position * size)
+            ):
+                continue
+            target.write(RECORD.pack(*record))
+            written += 1
+            previous = record
+        return written
+
+    def write_sorted_count(self, count):
+        """Атомарная запись числа отсортированных записей."""
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(COUNT.pack(count))
+        os.replace(temp_path, self.index_path)
+
+    def time_in_status(self, tenant, homework, status, now=None):
+        """Сколько секунд домашка провела в статусе."""
+        if now is None:
+            now = time.time()
+        records = self.records(tenant, homework, end=now)
+        return sum(
+            (
+                records[number + 1][0] if number + 1 < len(records) else now
+            ) - timestamp
+            for number, (timestamp, record_status) in enumerate(records)
+            if record_status == status
+        )
+
+
+HOMEWORK_DURATION = '{tenant} {homework}: {seconds} с в статусе {status}'
+
+
+if __name__ == '__main__':
+    log = HistoryLog(sys.argv[1])
+    status = sys.argv[2] if len(sys.argv) > 2 else 'reviewing'
+    now = time.time()
+    with open(log.path, 'rb') as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        keys = sorted({
+            RECORD.unpack_from(data, number * RECORD.size)[:2]
+            for number in range(log.total_count())
+        })
+    for tenant, homework in keys:
+        print(HOMEWORK_DURATION.format(
+            tenant=tenant, homework=homework, status=status,
+            seconds=int(log.time_in_status(tenant, homework, status, now))
+        ))
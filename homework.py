@@ -1,21 +1,52 @@
 import logging
 import os
 import time
-from http.client import OK
+from http import HTTPStatus
 
-import requests
-import telegram
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
 import exceptions
-
-load_dotenv()
+from catalog import Catalog
+from commands import start_commands
+from config import ConfigWatcher, read_settings, read_tenants
+from digest import Digest
+from health import Watchdog, start_health_server
+from history import HistoryLog, homework_time
+from profiling import Profiler
+from state import PollState
+from tracing import Tracer
+
+ENV_FILE = find_dotenv()
+# Окружение процесса до .env: при перечитывании оно, как и в load_dotenv,
+# важнее значений из файла.
+ENVIRONMENT = dict(os.environ)
+load_dotenv(ENV_FILE)
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+TENANTS_FILE = os.getenv('TENANTS_FILE', 'tenants.json')
+CATALOG_FILE = os.getenv('CATALOG_FILE', 'catalog.json')
+STATE_DIR = os.getenv('STATE_DIR', 'homework_state')
+HISTORY_FILE = os.getenv('HISTORY_FILE', 'homework_history.bin')
+WEBHOOK_PORT = os.getenv('WEBHOOK_PORT')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '127.0.0.1')
+DIGEST_WINDOW = int(os.getenv('DIGEST_WINDOW', 5))
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_CYCLES = int(os.getenv('PROFILE_CYCLES', 0))
+TRACE_FILE = os.getenv('TRACE_FILE')
+OTLP_ENDPOINT = os.getenv('OTLP_ENDPOINT')
+HEALTH_PORT = os.getenv('HEALTH_PORT')
+HEALTH_HOST = os.getenv('HEALTH_HOST', '127.0.0.1')
+WATCHDOG_THRESHOLD = int(os.getenv('WATCHDOG_THRESHOLD', 120))
+WATCHDOG_RESTART = os.getenv('WATCHDOG_RESTART', '').lower() in (
+    '1', 'true', 'yes'
+)
 
-RETRY_TIME = 600
+RETRY_TIME = int(os.getenv('RETRY_TIME', 600))
+RECONCILE_TIME = int(os.getenv('RECONCILE_TIME', 3600))
+REQUEST_TIMEOUT = 30
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
@@ -27,16 +58,45 @@ VERDICTS = {
 
 
 logger = logging.getLogger(__name__)
+profiler = Profiler(PROFILE_DIR, PROFILE_CYCLES)
+tracer = Tracer(TRACE_FILE, OTLP_ENDPOINT)
+watchdog = Watchdog(WATCHDOG_THRESHOLD, WATCHDOG_RESTART)
 
 SEND_INFO = 'Сообщение: "{message}" отправлено в чат'
 
 
+class LazyBot:
+    """telegram.Bot, который создаётся при первой отправке."""
+
+    def __init__(self, token):
+        self.token = token
+        self.bot = None
+
+    def __getattr__(self, name):
+        """Атрибуты настоящего бота."""
+        if self.bot is None:
+            import telegram
+            self.bot = telegram.Bot(token=self.token)
+        return getattr(self.bot, name)
+
+
 def send_message(bot, message):
     """Отправка сообщения в чат."""
-    bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+    send_to_chat(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_to_chat(bot, chat_id, message):
+    """Отправка сообщения в чат студента."""
+    bot.send_message(chat_id=chat_id, text=message)
     logger.info(SEND_INFO.format(message=message))
 
 
+def send_tracked(bot, chat_id, message):
+    """Отправка под сторожевым таймером, в том числе по таймеру сводки."""
+    with watchdog.track('sender'):
+        send_to_chat(bot, chat_id, message)
+
+
 SERVER_ERROR_INFORMATION = ['code', 'error']
 RESPONSE_ERROR = (
     'Cбой запроса: {error}, '
@@ -50,20 +110,32 @@ SERVER_ERROR = (
 
 def get_api_answer(current_timestamp):
     """Запрос к API."""
+    return request_statuses(current_timestamp, HEADERS)
+
+
+def request_statuses(current_timestamp, headers):
+    """Запрос к API с токеном конкретного студента."""
+    import requests
+
     request_params = dict(
         url=ENDPOINT,
-        headers=HEADERS,
-        params={'from_date': current_timestamp}
+        headers=headers,
+        params={'from_date': current_timestamp},
+        timeout=REQUEST_TIMEOUT
     )
     try:
         response = requests.get(**request_params)
     except requests.exceptions.RequestException as error:
-        raise ConnectionError(RESPONSE_ERROR.format(
+        raise exceptions.TemporaryAPIError(RESPONSE_ERROR.format(
             error=error,
             **request_params)
         )
-    if response.status_code != OK:
-        raise ConnectionError(RESPONSE_ERROR.format(
+    if response.status_code != HTTPStatus.OK:
+        error = ConnectionError
+        if (response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+                or response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR):
+            error = exceptions.TemporaryAPIError
+        raise error(RESPONSE_ERROR.format(
             error=response.status_code,
             **request_params)
         )
@@ -99,10 +171,28 @@ def check_response(response):
     return homeworks
 
 
+HOMEWORK_INVALID = 'Некорректная домашка в ответе API: {homework}'
+
+
+def check_homeworks(homeworks):
+    """Проверка полей каждой домашки до уведомления о ней."""
+    for homework in homeworks:
+        if not isinstance(homework, dict) or not all(
+            isinstance(homework.get(key), str)
+            for key in ('homework_name', 'status')
+        ) or not isinstance(homework.get('id', 0), int):
+            raise TypeError(HOMEWORK_INVALID.format(homework=homework))
+    return homeworks
+
+
 STATUS_MISSING = 'Неизвестный статус проверки: {response_status}'
 PARSE_STATUS = (
     'Изменился статус проверки работы "{name}". '
     '{status}')
+UNKNOWN_STATUS = (
+    'Изменился статус проверки работы "{name}". '
+    'Новый статус: {status}')
+catalog = Catalog(PARSE_STATUS, VERDICTS, UNKNOWN_STATUS, CATALOG_FILE)
 
 
 def parse_status(homework):
@@ -113,10 +203,7 @@ def parse_status(homework):
         raise ValueError(
             STATUS_MISSING.format(response_status=status)
         )
-    return PARSE_STATUS.format(
-        name=name,
-        status=VERDICTS[status]
-    )
+    return catalog.render(None, dict(homework_name=name, status=status))
 
 
 TOKENS_MISSING = 'Отсутствуют необходимые переменные среды {names}'
@@ -132,43 +219,258 @@ def check_tokens():
     return True
 
 
+def trace_change(homework, polled, diffed, rendered):
+    """Трассировка изменения статуса до постановки в сводку."""
+    started, answered = polled
+    trace = tracer.start(homework, homework_time(homework, started))
+    if trace is not None:
+        trace.span('poll_wait', started)
+        trace.span('get_api_answer', answered)
+        trace.span('diff', diffed)
+        trace.span('parse_status', rendered)
+    return trace
+
+
+def notify(digest, state, homeworks, current_date=None, polled=None):
+    """Уведомление об изменившихся статусах и фиксация их в состоянии."""
+    if polled is None:
+        polled = (time.time(),) * 2
+    with state.sync:
+        changed = state.diff(homeworks)
+        diffed = time.time()
+        with profiler.stage('parse_status'):
+            messages = [catalog.render(state.tenant, homework)
+                        for homework in changed]
+        rendered = time.time()
+        traces = [
+            trace_change(homework, polled, diffed, rendered)
+            for homework in changed
+        ]
+        state.commit(homeworks, current_date)
+        if not state.paused:
+            for message, trace in zip(messages, traces):
+                digest.add(message, trace)
+
+
+def poll(tenant):
+    """Один опрос API с уведомлением об изменившихся статусах."""
+    started = time.time()
+    with profiler.stage('get_api_answer'):
+        response = request_statuses(tenant.current_timestamp, tenant.headers)
+    polled = (started, time.time())
+    with profiler.stage('check_response'):
+        homeworks = check_homeworks(check_response(response))
+    tenant.current_timestamp = response.get('current_date',
+                                            tenant.current_timestamp)
+    with profiler.stage('notify'):
+        notify(tenant.digest, tenant.state, homeworks,
+               tenant.current_timestamp, polled)
+
+
+class Tenant:
+    """Студент: токен Практикума, чат и состояние опроса."""
+
+    def __init__(self, chat_id, token, bot, history_log):
+        self.chat_id = chat_id
+        self.token = token
+        # В журнал смен статусов пишутся только числовые id чатов.
+        self.state = PollState(
+            os.path.join(STATE_DIR, f'{chat_id}.json'), chat_id,
+            history_log if isinstance(chat_id, int) else None
+        )
+        self.digest = Digest(
+            lambda text: send_tracked(bot, chat_id, text),
+            DIGEST_WINDOW, tracer.export,
+            os.path.join(STATE_DIR, f'{chat_id}.digest.json')
+        )
+        self.current_timestamp = self.state.current_date or int(time.time())
+        self.pre_message = None
+
+    @property
+    def headers(self):
+        """Заголовки запроса к API с токеном студента."""
+        return {'Authorization': f'OAuth {self.token}'}
+
+
 CHECK_TOKENS_MISSING = 'Отсутствуют необходимые переменные среды'
+WEBHOOK_SECRET_MISSING = 'Для WEBHOOK_PORT нужна переменная WEBHOOK_SECRET'
 ERROR_MESSAGE = 'Сбой в работе: {error}'
-BOT_ERROR = 'Ошибка отправки сообщения в телеграмм'
+BOT_ERROR = 'Ошибка отправки сообщения в телеграмм: {error}'
+
+
+def run_tenant(tenant):
+    """Опрос API для студента и отправка накопленной сводки."""
+    try:
+        with watchdog.track('poller'):
+            poll(tenant)
+    except Exception as error:
+        message = ERROR_MESSAGE.format(error=error)
+        logger.error(message)
+        if message != tenant.pre_message:
+            tenant.digest.add(message)
+            tenant.pre_message = message
+    try:
+        with profiler.stage('send_message'):
+            tenant.digest.flush()
+    except Exception as error:
+        logger.error(BOT_ERROR.format(error=error))
+
+
+SETTINGS = {
+    'PRACTICUM_TOKEN': str,
+    'TELEGRAM_CHAT_ID': str,
+    'RETRY_TIME': int,
+    'RECONCILE_TIME': int,
+    'DIGEST_WINDOW': int,
+}
+SETTINGS_RELOADED = 'Настройки перечитаны'
+SETTINGS_ERROR = 'Настройки не перечитаны, работа с прежними: {error}'
+TENANT_ADDED = 'Добавлен студент {chat_id}'
+TENANT_REMOVED = 'Удалён студент {chat_id}'
+TENANT_UPDATED = 'Обновлён токен студента {chat_id}'
+
+
+def chat_key(chat_id):
+    """Числовой id чата — int, имя канала (@channel) — как есть."""
+    if isinstance(chat_id, str) and chat_id.lstrip('-').isdigit():
+        return int(chat_id)
+    return chat_id
+
+
+def load_config():
+    """Настройки, реестр студентов и каталог; при ошибке — исключение.
+    Каталог сообщений загружается последним, поэтому при ошибке в любом
+    из файлов ничего не меняется.
+    """
+    values = read_settings(ENV_FILE, SETTINGS, ENVIRONMENT)
+    settings = {
+        name: convert(values[name])
+        for name, convert in SETTINGS.items() if values[name] is not None
+    }
+    registry = read_tenants(TENANTS_FILE)
+    if settings.get('PRACTICUM_TOKEN') and settings.get('TELEGRAM_CHAT_ID'):
+        registry.setdefault(
+            chat_key(settings['TELEGRAM_CHAT_ID']),
+            settings['PRACTICUM_TOKEN']
+        )
+    catalog.load()
+    return settings, registry
+
+
+def reconcile(tenants, states, registry, bot, history_log):
+    """Приведение опрашиваемых студентов к реестру."""
+    for chat_id in set(tenants) - set(registry):
+        tenants[chat_id].digest.flush_quietly()
+        del tenants[chat_id]
+        del states[chat_id]
+        logger.info(TENANT_REMOVED.format(chat_id=chat_id))
+    for chat_id, token in registry.items():
+        tenant = tenants.get(chat_id)
+        if tenant is None:
+            tenant = tenants[chat_id] = Tenant(
+                chat_id, token, bot, history_log
+            )
+            states[chat_id] = tenant.state
+            logger.info(TENANT_ADDED.format(chat_id=chat_id))
+        elif tenant.token != token:
+            tenant.token = token
+            tenant.pre_message = None
+            logger.info(TENANT_UPDATED.format(chat_id=chat_id))
+        tenant.digest.window = DIGEST_WINDOW
+
+
+def apply_config(settings, registry, tenants, states, bot, history_log):
+    """Применение прочитанных настроек и реестра студентов."""
+    global HEADERS
+    globals().update(settings)
+    HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+    reconcile(tenants, states, registry, bot, history_log)
+
+
+def reload_config(tenants, states, bot, history_log):
+    """Атомарное перечитывание настроек; при ошибке остаются прежние."""
+    try:
+        settings, registry = load_config()
+    except Exception as error:
+        logger.error(SETTINGS_ERROR.format(error=error))
+        return
+    apply_config(settings, registry, tenants, states, bot, history_log)
+    logger.info(SETTINGS_RELOADED)
+
+
+def poll_interval():
+    """Пауза между опросами API по текущим настройкам."""
+    return RECONCILE_TIME if WEBHOOK_PORT else RETRY_TIME
+
+
+def find_tenant(tenants, event):
+    """Студент, к которому относится событие webhook."""
+    if 'chat_id' in event:
+        return tenants[chat_key(str(event['chat_id']))]
+    if len(tenants) != 1:
+        raise KeyError('chat_id')
+    return next(iter(tenants.values()))
+
+
+def handle_event(tenants, event):
+    """Событие webhook: уведомление студента об изменившихся статусах."""
+    homeworks = check_homeworks(check_response(event))
+    tenant = find_tenant(tenants, event)
+    notify(tenant.digest, tenant.state, homeworks)
 
 
 def main():
     """Основная логика работы бота."""
     if not check_tokens():
         raise ValueError(CHECK_TOKENS_MISSING)
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time())
-    pre_status = None
-    pre_message = None
-
-    while True:
-        try:
-            response = get_api_answer(current_timestamp)
-            homeworks = check_response(response)
-            if not homeworks:
+    if WEBHOOK_PORT and not WEBHOOK_SECRET:
+        raise ValueError(WEBHOOK_SECRET_MISSING)
+    os.makedirs(STATE_DIR, exist_ok=True)
+    bot = LazyBot(TELEGRAM_TOKEN)
+    history_log = HistoryLog(HISTORY_FILE)
+    history_log.start_compaction()
+    tenants = {}
+    states = {}
+    apply_config(*load_config(), tenants, states, bot, history_log)
+    updater = start_commands(TELEGRAM_TOKEN, states, catalog)
+    if WEBHOOK_PORT:
+        from webhook import start_webhook
+
+        server = start_webhook(
+            int(WEBHOOK_PORT), WEBHOOK_SECRET,
+            lambda event: handle_event(tenants, event), WEBHOOK_HOST
+        )
+    watcher = ConfigWatcher([ENV_FILE, TENANTS_FILE, CATALOG_FILE])
+    watcher.install_signal()
+    watcher.start()
+    profiler.install_signal()
+    watchdog.start()
+    if HEALTH_PORT:
+        health_server = start_health_server(
+            int(HEALTH_PORT), watchdog, HEALTH_HOST
+        )
+    polled_at = None
+    next_poll = time.time()
+
+    try:
+        while True:
+            if watcher.wait(max(0, next_poll - time.time())):
+                reload_config(tenants, states, bot, history_log)
+                if polled_at is not None:
+                    next_poll = polled_at + poll_interval()
                 continue
-            homework_status = homeworks[0].get('status')
-            if homework_status != pre_status:
-                send_message(bot, parse_status(homeworks[0]))
-                pre_status = homework_status
-                current_timestamp = response.get('current_date',
-                                                 current_timestamp)
-        except Exception as error:
-            message = ERROR_MESSAGE.format(error=error)
-            logger.error(message)
-            if message != pre_message:
-                try:
-                    send_message(bot, message)
-                    pre_message = message
-                except exceptions.BotSendMessageError:
-                    logger.error(BOT_ERROR)
-        finally:
-            time.sleep(RETRY_TIME)
+            with profiler.cycle():
+                for tenant in list(tenants.values()):
+                    run_tenant(tenant)
+            watchdog.ready = True
+            polled_at = time.time()
+            next_poll = polled_at + poll_interval()
+    finally:
+        updater.stop()
+        if WEBHOOK_PORT:
+            server.shutdown()
+        if HEALTH_PORT:
+            health_server.shutdown()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,156 @@
+import argparse
+import csv
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import exceptions
+import homework
+from config import read_tenants, write_tenants
+
+logger = logging.getLogger(__name__)
+
+WORKERS = 32
+ATTEMPTS = 3
+BACKOFF = 1
+TOKEN_MISSING = 'Не указан practicum_token'
+ROW_INVALID = 'Строка не является объектом: {row}'
+ONBOARDED = (
+    'Проверено {total}: добавлено {valid}, с ошибками {failed}, '
+    'отложено из-за временных сбоев {deferred}'
+)
+TENANT_FAILED = 'Чат {chat_id}: {error}'
+TENANT_DEFERRED = 'Чат {chat_id}: временный сбой, повторите позже: {error}'
+
+
+def read_rows(path):
+    """Строки (chat_id, practicum_token) из CSV или JSON."""
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.json'):
+            return json.load(file)
+        return list(csv.DictReader(file))
+
+
+def retry_delay(error, attempt):
+    """Пауза перед повтором после временного сбоя; None — повтор не нужен."""
+    from telegram.error import BadRequest, NetworkError, RetryAfter
+
+    if isinstance(error, RetryAfter):
+        return error.retry_after
+    if isinstance(error, exceptions.TemporaryAPIError) or (
+        isinstance(error, NetworkError) and not isinstance(error, BadRequest)
+    ):
+        return BACKOFF * 2 ** attempt
+    return None
+
+
+def check_row(row, bot):
+    """Токен студента, проверенный в API Практикума и Telegram."""
+    if not isinstance(row, dict):
+        raise TypeError(ROW_INVALID.format(row=row))
+    chat_id = int(row['chat_id'])
+    token = (row.get('practicum_token') or '').strip()
+    if not token:
+        raise ValueError(TOKEN_MISSING)
+    homework.check_response(homework.request_statuses(
+        int(time.time()), {'Authorization': f'OAuth {token}'}
+    ))
+    bot.get_chat(chat_id=chat_id)
+    return chat_id, token
+
+
+def validate(row, bot):
+    """Проверка студента с повтором при временных сбоях.
+    Сбои сети, 429 и 5xx API Практикума, RetryAfter и таймауты Telegram
+    повторяются до ATTEMPTS раз; если сбой не прошёл, строка попадает
+    в отчёт с retry=True, а не считается ошибочной.
+    """
+    for attempt in range(ATTEMPTS):
+        try:
+            chat_id, token = check_row(row, bot)
+        except Exception as error:
+            failure = error
+            delay = retry_delay(error, attempt)
+            if delay is None or attempt + 1 == ATTEMPTS:
+                break
+            time.sleep(delay)
+        else:
+            return dict(chat_id=chat_id, ok=True, practicum_token=token)
+    message = str(failure)
+    if isinstance(row, dict):
+        token = (row.get('practicum_token') or '').strip()
+        if token:
+            message = message.replace(token, '***')
+    return dict(
+        chat_id=row.get('chat_id') if isinstance(row, dict) else None,
+        ok=False, retry=delay is not None, error=message
+    )
+
+
+def onboard(rows, bot, registry_path, workers=WORKERS):
+    """Параллельная проверка студентов и запись прошедших в реестр."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda row: validate(row, bot), rows))
+    valid = {
+        result['chat_id']: result['practicum_token']
+        for result in results if result['ok']
+    }
+    if valid:
+        registry = read_tenants(registry_path)
+        registry.update(valid)
+        write_tenants(registry_path, registry)
+    return [
+        {key: value for key, value in result.items()
+         if key != 'practicum_token'}
+        for result in results
+    ]
+
+
+def make_bot(workers):
+    """Бот с пулом соединений на все потоки проверки."""
+    import telegram
+    from telegram.utils.request import Request
+
+    return telegram.Bot(
+        token=homework.TELEGRAM_TOKEN,
+        request=Request(con_pool_size=workers)
+    )
+
+
+def main():
+    """Массовое добавление студентов из файла."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('path', help='CSV или JSON с chat_id, practicum_token')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--registry', default=homework.TENANTS_FILE)
+    parser.add_argument('--report', help='файл для отчёта в JSON')
+    args = parser.parse_args()
+
+    report = onboard(
+        read_rows(args.path), make_bot(args.workers), args.registry,
+        args.workers
+    )
+    failed = [result for result in report
+              if not result['ok'] and not result['retry']]
+    deferred = [result for result in report if result.get('retry')]
+    for result in failed:
+        logger.error(TENANT_FAILED.format(**result))
+    for result in deferred:
+        logger.warning(TENANT_DEFERRED.format(**result))
+    logger.info(ONBOARDED.format(
+        total=len(report),
+        valid=len(report) - len(failed) - len(deferred),
+        failed=len(failed), deferred=len(deferred)
+    ))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+        level=logging.INFO,
+    )
+    main()
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import signal
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+NOT_PROFILING = nullcontext()
+PROFILE_STARTED = 'Профилирование следующих {cycles} итераций'
+PROFILE_SAVED = 'Профиль {cycles} итераций сохранён в {path}.*'
+PROFILE_ERROR = 'Не удалось сохранить профиль в {path}: {error}'
+CYCLE_TIMINGS = 'Итерация {number}: {timings}'
+
+
+class Profiler:
+    """Профилирование N итераций цикла опроса по запросу.
+    Включается при запуске (cycles) или сигналом SIGUSR1 без перезапуска.
+    Пока профилирование выключено, cycle() и stage() возвращают
+    заранее созданный пустой контекстный менеджер.
+    """
+
+    def __init__(self, directory, cycles=0, signal_cycles=10):
+        self.directory = directory
+        self.remaining = cycles
+        self.signal_cycles = signal_cycles
+        self.active = False
+        self.profile = None
+        self.cycles = []
+        self.timings = None
+
+    def install_signal(self):
+        """Запуск профилирования по SIGUSR1."""
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.on_signal)
+
+    def on_signal(self, signum, frame):
+        """Обработчик сигнала: только выставляет счётчик итераций."""
+        self.remaining = self.signal_cycles
+
+    def cycle(self):
+        """Контекст одной итерации цикла опроса."""
+        if not self.remaining:
+            return NOT_PROFILING
+        return self.profiled_cycle()
+
+    def stage(self, name):
+        """Контекст этапа итерации с замером времени."""
+        if not self.active:
+            return NOT_PROFILING
+        return self.timed_stage(name)
+
+    @contextmanager
+    def profiled_cycle(self):
+        """Итерация под профилировщиком с замерами этапов."""
+        if self.profile is None:
+            self.start()
+        self.timings = {}
+        self.active = True
+        try:
+            with self.timed_stage('cycle'):
+                yield
+        finally:
+            self.active = False
+            self.cycles.append(self.timings)
+            logger.info(CYCLE_TIMINGS.format(
+                number=len(self.cycles), timings=self.timings
+            ))
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.remaining = 0
+                self.stop()
+
+    @contextmanager
+    def timed_stage(self, name):
+        """Накопление настенного и процессорного времени этапа."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            total = self.timings.setdefault(name, dict(wall=0.0, cpu=0.0))
+            total['wall'] += time.perf_counter() - wall
+            total['cpu'] += time.process_time() - cpu
+
+    def start(self):
+        """Запуск cProfile и tracemalloc."""
+        import cProfile
+        import tracemalloc
+
+        logger.info(PROFILE_STARTED.format(cycles=self.remaining))
+        self.cycles = []
+        tracemalloc.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        """Остановка профилирования и запись результатов на диск.
+        Ошибка записи только попадает в журнал: профилирование в любом
+        случае выключается, а цикл опроса продолжает работу.
+        """
+        import tracemalloc
+
+        profile, self.profile = self.profile, None
+        profile.disable()
+        try:
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        path = os.path.join(
+            self.directory, time.strftime('cycles-%Y%m%d-%H%M%S')
+        )
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path + '.prof')
+            snapshot.dump(path + '.tracemalloc')
+            with open(path + '.json', 'w', encoding='utf-8') as file:
+                json.dump(self.cycles, file, indent=2)
+        except OSError as error:
+            logger.error(PROFILE_ERROR.format(path=path, error=error))
+            return
+        logger.info(PROFILE_SAVED.format(cycles=len(self.cycles), path=path))
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from history import homework_id, homework_time
+
+logger = logging.getLogger(__name__)
+
+HISTORY_LIMIT = 50
+STATE_LOAD_ERROR = 'Не удалось загрузить состояние из {path}: {error}'
+STATE_SAVE_ERROR = 'Не удалось сохранить состояние в {path}: {error}'
+HISTORY_APPEND_ERROR = 'Не удалось записать смену статуса в журнал: {error}'
+
+
+class PollState:
+    """Результат последнего опроса API, общий для цикла и команд бота."""
+
+    def __init__(self, path=None, tenant=None, history_log=None):
+        self.path = path
+        self.tenant = tenant
+        self.history_log = history_log
+        self.lock = threading.Lock()
+        # Опрос API и приём событий не должны уведомить об одном и том же.
+        self.sync = threading.Lock()
+        self.homeworks = {}
+        self.history = []
+        self.current_date = None
+        self.updated_at = None
+        self.paused = False
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self):
+        """Чтение сохранённого состояния с диска."""
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as error:
+            logger.error(STATE_LOAD_ERROR.format(path=self.path, error=error))
+            return
+        self.homeworks = data.get('homeworks', {})
+        self.history = data.get('history', [])
+        self.current_date = data.get('current_date')
+        self.updated_at = data.get('updated_at')
+        self.paused = data.get('paused', False)
+
+    def save(self):
+        """Атомарная запись состояния на диск."""
+        if not self.path:
+            return
+        data = dict(
+            homeworks=self.homeworks,
+            history=self.history,
+            current_date=self.current_date,
+            updated_at=self.updated_at,
+            paused=self.paused,
+        )
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            logger.error(STATE_SAVE_ERROR.format(path=self.path, error=error))
+
+    def diff(self, homeworks):
+        """Домашки, статус которых отличается от сохранённого."""
+        with self.lock:
+            return [
+                homework for homework in homeworks
+                if self.homeworks.get(
+                    homework['homework_name'], {}
+                ).get('status') != homework['status']
+            ]
+
+    def commit(self, homeworks, current_date=None):
+        """Фиксация результата опроса API."""
+        now = time.time()
+        with self.lock:
+            for homework in homeworks:
+                name = homework['homework_name']
+                if self.homeworks.get(name, {}).get('status') != (
+                    homework['status']
+                ):
+                    self.history.append(dict(
+                        name=name, status=homework['status'], time=now
+                    ))
+                    if self.history_log is not None:
+                        self.append_history(homework, now)
+                self.homeworks[name] = dict(
+                    status=homework['status'],
+                    date_updated=homework.get('date_updated'),
+                )
+            del self.history[:-HISTORY_LIMIT]
+            if current_date is not None:
+                self.current_date = current_date
+            self.updated_at = now
+            self.save()
+
+    def append_history(self, homework, now):
+        """Запись смены статуса в журнал; ошибка не мешает сохранению."""
+        try:
+            self.history_log.append(
+                self.tenant, homework_id(homework),
+                homework['status'], homework_time(homework, now)
+            )
+        except OSError as error:
+            logger.error(HISTORY_APPEND_ERROR.format(error=error))
+
+    def toggle_pause(self):
+        """Приостановка или возобновление уведомлений."""
+        with self.lock:
+            self.paused = not self.paused
+            self.save()
+            return self.paused
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from catalog import Catalog
+
+
+class TestCatalog:
+    TEMPLATE = 'Работа "{name}": {status}'
+    VERDICTS = {'approved': 'принята {ура}', 'rejected': 'есть замечания'}
+    UNKNOWN = 'Работа "{name}": статус {status}'
+
+    def make_catalog(self, tmp_path, **kwargs):
+        path = tmp_path / 'catalog.json'
+        path.write_text(json.dumps({
+            'locales': {'en': {
+                'template': 'Homework "{name}": {status}',
+                'verdicts': {'approved': 'approved'},
+                'unknown': 'Homework "{name}": {status}',
+            }},
+            'chats': {
+                '1': {'locale': 'en'},
+                '2': {'verdicts': {'approved': 'Ура!'}},
+            },
+        }))
+        return Catalog(self.TEMPLATE, self.VERDICTS, self.UNKNOWN,
+                       str(path), **kwargs)
+
+    def test_render(self, tmp_path):
+        catalog = self.make_catalog(tmp_path)
+        homework = {'homework_name': 'hw{1}', 'status': 'approved'}
+        assert catalog.render(None, homework) == (
+            'Работа "hw{1}": принята {ура}'
+        )
+        assert catalog.render(1, homework) == 'Homework "hw{1}": approved'
+        assert catalog.render(2, homework) == 'Работа "hw{1}": Ура!'
+        assert catalog.render(2, dict(homework, status='rejected')) == (
+            'Работа "hw{1}": есть замечания'
+        )
+
+    def test_unknown_status_degrades(self, tmp_path):
+        catalog = self.make_catalog(tmp_path)
+        assert catalog.render(1, {
+            'homework_name': 'hw', 'status': 'on_hold'
+        }) == 'Homework "hw": on_hold'
+
+    def test_cache_bounded(self, tmp_path):
+        catalog = self.make_catalog(tmp_path, cache_size=2)
+        for name in ['a', 'b', 'c']:
+            catalog.render(None, {'homework_name': name,
+                                  'status': 'approved'})
+        assert [key[2] for key in catalog.cache] == ['b', 'c']
+
+    def test_verdict_per_chat(self, tmp_path):
+        catalog = self.make_catalog(tmp_path)
+        assert catalog.verdict(None, 'approved') == 'принята {ура}'
+        assert catalog.verdict(1, 'approved') == 'approved'
+        assert catalog.verdict(2, 'approved') == 'Ура!'
+        assert catalog.verdict(1, 'on_hold') == 'on_hold'
+
+    @pytest.mark.parametrize('data', [
+        [],
+        {'locales': []},
+        {'locales': {'en': 'English'}},
+        {'locales': {'en': {'verdicts': {'approved': 1}}}},
+        {'chats': {'1': {'locale': 'de'}}},
+        {'chats': {'first': {}}},
+        {'chats': {'1': ['en']}},
+        {'locales': {'en': {'template': '{state} "{name}"'}}},
+        {'locales': {'en': {'unknown': '"{name}": {state}'}}},
+        {'chats': {'1': {'template': '"{name}": {status!r}'}}},
+    ])
+    def test_malformed_rejected(self, tmp_path, data):
+        catalog = self.make_catalog(tmp_path)
+        catalog.render(1, {'homework_name': 'hw', 'status': 'approved'})
+        (tmp_path / 'catalog.json').write_text(json.dumps(data))
+        with pytest.raises(ValueError):
+            catalog.load()
+        assert catalog.verdict(1, 'approved') == 'approved', (
+            'При ошибке должен остаться прежний каталог'
+        )
+
+    def test_escaped_braces(self, tmp_path):
+        catalog = Catalog('Работа {{важно}} "{name}": {status}',
+                          self.VERDICTS, 'Работа {{важно}}: {status}')
+        assert catalog.render(None, {
+            'homework_name': 'hw', 'status': 'approved'
+        }) == 'Работа {важно} "hw": принята {ура}'
+        assert catalog.render(None, {
+            'homework_name': 'hw', 'status': 'on_hold'
+        }) == 'Работа {важно}: on_hold'
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import commands
+from catalog import Catalog
+from state import PollState
+
+
+def run_command(handler, chat_id, states, catalog=None):
+    replies = []
+    handler(SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id),
+        message=SimpleNamespace(reply_text=replies.append),
+    ), SimpleNamespace(bot_data={'states': states, 'catalog': catalog}))
+    return replies
+
+
+class TestCommands:
+
+    def test_status_uses_chat_catalog(self, tmp_path):
+        path = tmp_path / 'catalog.json'
+        path.write_text('{"chats": {"5": {"verdicts": {"approved": "Ура!"}}}}')
+        catalog = Catalog('"{name}": {status}', {'approved': 'принята'},
+                          '"{name}": {status}', str(path))
+        states = {}
+        for chat_id in [4, 5]:
+            states[chat_id] = PollState(tenant=chat_id)
+            states[chat_id].commit(
+                [{'homework_name': 'hw', 'status': 'approved'}], 100
+            )
+        replies = [
+            run_command(commands.status, chat_id, states, catalog)[0]
+            for chat_id in [4, 5]
+        ]
+        assert [reply.split('\n')[0] for reply in replies] == [
+            '"hw": принята', '"hw": Ура!'
+        ], '/status должен брать вердикты из каталога чата'
+
+    def test_history(self):
+        state = PollState(tenant=1)
+        assert run_command(commands.history, 1, {1: state}) == [
+            commands.HISTORY_EMPTY
+        ]
+        for number in range(commands.HISTORY_SIZE + 2):
+            state.commit([{'homework_name': f'hw{number}',
+                           'status': 'reviewing'}])
+        lines = run_command(commands.history, 1, {1: state})[0].split('\n')
+        assert len(lines) == commands.HISTORY_SIZE + 1
+        assert lines[0].endswith('"hw2": reviewing'), (
+            '/history должен показывать последние HISTORY_SIZE изменений'
+        )
+        assert lines[-1] == commands.freshness(state)
+        assert run_command(commands.history, 2, {1: state}) == []
+
+    def test_pause_persisted(self, tmp_path):
+        path = str(tmp_path / 'state.json')
+        states = {1: PollState(path, 1)}
+        assert run_command(commands.pause, 1, states) == [commands.PAUSED]
+        assert PollState(path).paused
+        assert run_command(commands.pause, 1, states) == [commands.RESUMED]
+        assert not PollState(path).paused, (
+            '/pause должен сохранять настройку в состоянии чата'
+        )
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from config import ConfigWatcher, read_settings, read_tenants, write_tenants
+
+
+class TestConfig:
+
+    def test_tenants_roundtrip(self, tmp_path):
+        path = str(tmp_path / 'tenants.json')
+        assert read_tenants(path) == {}
+        write_tenants(path, {1: 'token1', 2: 'token2'})
+        assert read_tenants(path) == {1: 'token1', 2: 'token2'}
+
+    @pytest.mark.parametrize('content', [
+        '{"1": "token"}', '["token"]', '[{"chat_id": 1}]', 'not json',
+    ])
+    def test_malformed_tenants_rejected(self, tmp_path, content):
+        path = tmp_path / 'tenants.json'
+        path.write_text(content)
+        with pytest.raises(ValueError):
+            read_tenants(str(path))
+
+    def test_environment_overrides_env_file(self, tmp_path):
+        env_file = tmp_path / '.env'
+        env_file.write_text('RETRY_TIME=60\nDIGEST_WINDOW=1\nOTHER=1\n')
+        assert read_settings(
+            str(env_file), ['RETRY_TIME', 'DIGEST_WINDOW', 'RECONCILE_TIME'],
+            {'RETRY_TIME': '600'}
+        ) == {'RETRY_TIME': '600', 'DIGEST_WINDOW': '1',
+              'RECONCILE_TIME': None}
+
+    def test_watcher_sees_file_change(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text('[]')
+        watcher = ConfigWatcher([str(path)], interval=0.01)
+        watcher.start()
+        assert not watcher.wait(0.05)
+        os.utime(path, ns=(0, 0))
+        assert watcher.wait(1)
+        assert not watcher.wait(0.05)
+
+    def test_reconcile(self, tmp_path, monkeypatch):
+        import homework
+
+        monkeypatch.setattr(homework, 'STATE_DIR', str(tmp_path))
+        tenants = {}
+        states = {}
+        homework.reconcile(tenants, states, {1: 'a', 2: 'b'}, None, None)
+        first = tenants[1]
+        homework.reconcile(tenants, states, {1: 'c', 3: 'd'}, None, None)
+        assert sorted(tenants) == sorted(states) == [1, 3]
+        assert tenants[1] is first, (
+            'Студент с прежним chat_id не должен пересоздаваться'
+        )
+        assert tenants[1].headers == {'Authorization': 'OAuth c'}
+
+    def test_bad_registry(self, tmp_path, monkeypatch):
+        import homework
+
+        path = tmp_path / 'tenants.json'
+        path.write_text('[{"chat_id": 1, "practicum_token": "a"}]')
+        monkeypatch.setattr(homework, 'STATE_DIR', str(tmp_path))
+        monkeypatch.setattr(homework, 'TENANTS_FILE', str(path))
+        monkeypatch.setattr(homework, 'ENVIRONMENT', {})
+        monkeypatch.setattr(homework, 'ENV_FILE', '')
+        tenants = {}
+        states = {}
+        homework.reload_config(tenants, states, None, None)
+        assert list(tenants) == [1]
+
+        path.write_text('{"1": "token"}')
+        homework.reload_config(tenants, states, None, None)
+        assert list(tenants) == [1], (
+            'При ошибке в реестре должны остаться прежние студенты'
+        )
+        with pytest.raises(ValueError):
+            homework.load_config()
+
+    @pytest.mark.parametrize('chat_id, key', [
+        ('@channel', '@channel'), ('-100123', -100123), ('42', 42),
+    ])
+    def test_legacy_chat_id(self, tmp_path, monkeypatch, chat_id, key):
+        import homework
+
+        monkeypatch.setattr(homework, 'TENANTS_FILE', str(tmp_path / 'none'))
+        monkeypatch.setattr(homework, 'ENV_FILE', '')
+        monkeypatch.setattr(homework, 'ENVIRONMENT', {
+            'TELEGRAM_CHAT_ID': chat_id, 'PRACTICUM_TOKEN': 'token'
+        })
+        assert homework.load_config()[1] == {key: 'token'}
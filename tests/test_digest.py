@@ -0,0 +1,55 @@
+import pytest
+
+from digest import Digest, split_digest
+
+
+class TestDigest:
+
+    def test_split_digest(self):
+        assert split_digest(['a', 'b']) == ['a\n\nb']
+        assert split_digest(['a' * 6, 'b' * 3], limit=10) == ['a' * 6, 'b' * 3]
+        assert split_digest(['a' * 25], limit=10) == [
+            'a' * 10, 'a' * 10, 'a' * 5
+        ]
+        assert split_digest([]) == []
+
+    def test_flush_sends_once_per_cycle(self):
+        sent = []
+        digest = Digest(sent.append)
+        for number in range(10):
+            digest.add(f'message {number}')
+        digest.flush()
+        digest.flush()
+        assert len(sent) == 1, (
+            'Накопленные за цикл уведомления должны уходить одним сообщением'
+        )
+
+    def test_failed_flush_keeps_messages(self):
+        def fail(text):
+            raise ConnectionError(text)
+
+        digest = Digest(fail)
+        digest.add('message')
+        with pytest.raises(ConnectionError):
+            digest.flush()
+        sent = []
+        digest.send = sent.append
+        digest.flush()
+        assert sent == ['message']
+
+    def test_queue_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'digest.json')
+
+        def hang(text):
+            restarted = Digest(sent.append, path=path)
+            restarted.flush()
+
+        sent = []
+        digest = Digest(hang, path=path)
+        digest.add('message')
+        digest.flush()
+        assert sent == ['message'], (
+            'Сообщение, отправка которого не завершилась, '
+            'должно уйти после перезапуска'
+        )
+        assert Digest(sent.append, path=path).messages == []
@@ -0,0 +1,75 @@
+import json
+from http import HTTPStatus
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from health import Watchdog, start_health_server
+
+
+def get(server, path):
+    url = 'http://127.0.0.1:{}{}'.format(server.server_address[1], path)
+    try:
+        with urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read() or 'null')
+
+
+class TestWatchdog:
+
+    def test_stall_detected(self):
+        watchdog = Watchdog(threshold=-1)
+        with watchdog.track('poller'):
+            assert set(watchdog.stalled()) == {'poller'}
+            watchdog.check()
+            assert watchdog.reported == {'poller'}
+            assert not watchdog.status()['alive']
+        assert watchdog.stalled() == {}
+        assert watchdog.reported == set()
+        assert 'poller' in watchdog.status()['last_progress']
+
+    def test_health_endpoints(self):
+        watchdog = Watchdog(threshold=-1)
+        server = start_health_server(0, watchdog)
+        try:
+            assert get(server, '/healthz')[0] == HTTPStatus.OK
+            assert get(server, '/readyz')[0] == (
+                HTTPStatus.SERVICE_UNAVAILABLE
+            )
+            watchdog.ready = True
+            assert get(server, '/readyz')[0] == HTTPStatus.OK
+            with watchdog.track('sender'):
+                status, body = get(server, '/healthz')
+            assert status == HTTPStatus.SERVICE_UNAVAILABLE
+            assert 'sender' in body['stalled']
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_parallel_operations():
+    watchdog = Watchdog(threshold=-1)
+    with watchdog.track('sender'):
+        with watchdog.track('sender'):
+            pass
+        assert set(watchdog.stalled()) == {'sender'}, (
+            'Параллельная операция не должна снимать слежение за другой'
+        )
+    assert watchdog.stalled() == {}
+
+
+def test_timer_flush_tracked(monkeypatch, tmp_path):
+    import homework
+
+    stalled = []
+
+    class HangingBot:
+        def send_message(self, chat_id, text):
+            stalled.append(set(homework.watchdog.stalled()))
+
+    monkeypatch.setattr(homework, 'STATE_DIR', str(tmp_path))
+    monkeypatch.setattr(homework, 'watchdog', Watchdog(threshold=-1))
+    tenant = homework.Tenant(1, 'token', HangingBot(), None)
+    tenant.digest.add('message')
+    tenant.digest.flush_quietly()
+    assert stalled == [{'sender'}]
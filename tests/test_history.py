@@ -0,0 +1,88 @@
+import random
+
+from history import RECORD, STATUS_CODES, HistoryLog
+
+
+class TestHistoryLog:
+
+    def test_records_and_compact(self, tmp_path):
+        log = HistoryLog(str(tmp_path / 'history.bin'))
+        log.append(1, 10, 'reviewing', 100)
+        log.append(2, 10, 'reviewing', 150)
+        log.append(1, 10, 'reviewing', 120)
+        log.append(1, 10, 'approved', 400)
+        log.append(1, 11, 'rejected', 500)
+        assert log.records(1, 10, end=1000) == [
+            (100, 'reviewing'), (120, 'reviewing'), (400, 'approved')
+        ]
+
+        log.compact()
+        assert log.sorted_count() == 4, (
+            'Сжатие должно убрать повтор статуса reviewing'
+        )
+        assert log.total_count() * RECORD.size == (
+            (tmp_path / 'history.bin').stat().st_size
+        )
+        log.append(1, 10, 'rejected', 600)
+        assert log.tail_size() == 1
+        assert log.records(1, 10, end=1000) == [
+            (100, 'reviewing'), (400, 'approved'), (600, 'rejected')
+        ]
+        assert log.records(1, 10, start=200, end=500) == [
+            (400, 'approved')
+        ]
+        assert log.records(1, 12, end=1000) == []
+
+    def test_time_in_status(self, tmp_path):
+        log = HistoryLog(str(tmp_path / 'history.bin'))
+        log.append(1, 10, 'reviewing', 100)
+        log.append(1, 10, 'rejected', 400)
+        log.append(1, 10, 'reviewing', 500)
+        log.compact()
+        assert log.time_in_status(1, 10, 'reviewing', now=700) == 500
+        assert log.time_in_status(1, 10, 'rejected', now=700) == 100
+
+    def test_incremental_compact_matches_full_sort(self, tmp_path):
+        log = HistoryLog(str(tmp_path / 'history.bin'))
+        generator = random.Random(1)
+        expected = []
+        for batch in range(3):
+            records = set(expected)
+            for _ in range(300):
+                record = (generator.randint(1, 3), generator.randint(1, 20),
+                          generator.randint(0, 1000),
+                          generator.choice(['reviewing', 'approved']))
+                log.append(record[0], record[1], record[3], record[2])
+                records.add(record[:3] + (STATUS_CODES[record[3]],))
+            expected = []
+            for record in sorted(records):
+                if expected and expected[-1][:2] == record[:2] and (
+                    expected[-1][3] == record[3]
+                ):
+                    continue
+                expected.append(record)
+            log.compact()
+            assert log.tail_size() == 0
+            with open(log.path, 'rb') as file:
+                data = file.read()
+            assert [
+                RECORD.unpack_from(data, number * RECORD.size)
+                for number in range(len(data) // RECORD.size)
+            ] == expected, (
+                'Слияние хвоста должно давать то же, что полная сортировка'
+            )
+
+    def test_appends_during_compact_kept(self, tmp_path, monkeypatch):
+        log = HistoryLog(str(tmp_path / 'history.bin'))
+        log.append(1, 10, 'reviewing', 100)
+        merge = HistoryLog.merge
+
+        def merge_and_append(*args):
+            log.append(1, 10, 'approved', 200)
+            return merge(*args)
+
+        monkeypatch.setattr(log, 'merge', merge_and_append)
+        log.compact()
+        assert log.records(1, 10, end=1000) == [
+            (100, 'reviewing'), (200, 'approved')
+        ]
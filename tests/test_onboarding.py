@@ -0,0 +1,84 @@
+import requests
+
+import onboarding
+from config import read_tenants
+
+
+class MockResponse:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def json(self):
+        return {'homeworks': [], 'current_date': 0}
+
+
+class MockBot:
+
+    def get_chat(self, chat_id):
+        if chat_id == 3:
+            raise ValueError('Chat not found')
+
+
+class TestOnboarding:
+
+    def test_onboard(self, tmp_path, monkeypatch):
+        def mock_get(url, headers=None, **kwargs):
+            valid = headers['Authorization'] != 'OAuth bad'
+            return MockResponse(200 if valid else 401)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        path = tmp_path / 'students.csv'
+        path.write_text(
+            'chat_id,practicum_token\n1,good\n2,bad\n3,good\n4,\n5,good\n'
+        )
+        registry = str(tmp_path / 'tenants.json')
+
+        report = onboarding.onboard(
+            onboarding.read_rows(str(path)), MockBot(), registry, workers=4
+        )
+
+        assert read_tenants(registry) == {1: 'good', 5: 'good'}
+        assert [result['ok'] for result in report] == [
+            True, False, False, False, True
+        ]
+        assert all('bad' not in result.get('error', '') for result in report), (
+            'Токен не должен попадать в отчёт'
+        )
+
+    def test_transient_errors(self, tmp_path, monkeypatch):
+        from telegram.error import RetryAfter, TimedOut
+
+        answers = {
+            'flaky': [503, 200], 'down': [503] * 3,
+            'limited': [200, 200], 'slow': [200] * 3,
+        }
+        chat_errors = {7: [RetryAfter(0)], 8: [TimedOut()] * 3}
+
+        def mock_get(url, headers=None, **kwargs):
+            token = headers['Authorization'].split()[1]
+            return MockResponse(answers[token].pop(0))
+
+        class FlakyBot:
+            def get_chat(self, chat_id):
+                if chat_errors.get(chat_id):
+                    raise chat_errors[chat_id].pop(0)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(onboarding, 'BACKOFF', 0)
+        rows = [
+            {'chat_id': 1, 'practicum_token': 'flaky'},
+            {'chat_id': 2, 'practicum_token': 'down'},
+            {'chat_id': 7, 'practicum_token': 'limited'},
+            {'chat_id': 8, 'practicum_token': 'slow'},
+            ['not', 'an', 'object'],
+        ]
+        registry = str(tmp_path / 'tenants.json')
+
+        report = onboarding.onboard(rows, FlakyBot(), registry, workers=2)
+
+        assert read_tenants(registry) == {1: 'flaky', 7: 'limited'}
+        assert [(result['ok'], result.get('retry')) for result in report] == [
+            (True, None), (False, True), (True, None), (False, True),
+            (False, False)
+        ], 'Временные сбои должны повторяться и отмечаться в отчёте'
@@ -0,0 +1,35 @@
+from profiling import NOT_PROFILING, Profiler
+
+
+class TestProfiler:
+
+    def test_off_by_default(self, tmp_path):
+        profiler = Profiler(str(tmp_path))
+        assert profiler.cycle() is NOT_PROFILING
+        assert profiler.stage('get_api_answer') is NOT_PROFILING
+        assert not list(tmp_path.iterdir())
+
+    def test_profiles_requested_cycles(self, tmp_path):
+        profiler = Profiler(str(tmp_path), signal_cycles=2)
+        profiler.on_signal(None, None)
+        for _ in range(3):
+            with profiler.cycle():
+                with profiler.stage('parse_status'):
+                    sum(range(1000))
+        assert len(profiler.cycles) == 2
+        assert set(profiler.cycles[0]) == {'cycle', 'parse_status'}
+        assert sorted(path.suffix for path in tmp_path.iterdir()) == [
+            '.json', '.prof', '.tracemalloc'
+        ]
+
+    def test_write_error_not_raised(self, tmp_path):
+        import tracemalloc
+
+        blocker = tmp_path / 'file'
+        blocker.write_text('')
+        profiler = Profiler(str(blocker / 'profiles'), cycles=1)
+        with profiler.cycle():
+            pass
+        assert profiler.profile is None
+        assert not tracemalloc.is_tracing()
+        assert profiler.cycle() is NOT_PROFILING
@@ -0,0 +1,14 @@
+import benchmark_startup
+
+
+class TestStartup:
+
+    def test_heavy_modules_not_imported(self):
+        heavy = benchmark_startup.heavy_imported()
+        assert not heavy, (
+            'Импорт homework не должен загружать тяжёлые модули, '
+            f'а загрузил: {heavy}'
+        )
+
+    def test_import_time_measured(self):
+        assert benchmark_startup.import_time() > 0
@@ -0,0 +1,45 @@
+from state import PollState
+
+
+class TestPollState:
+    HOMEWORK = {'homework_name': 'hw123', 'status': 'reviewing'}
+
+    def test_diff_and_commit(self, tmp_path):
+        state = PollState(str(tmp_path / 'state.json'))
+        assert state.diff([self.HOMEWORK]) == [self.HOMEWORK], (
+            'Новая домашка должна считаться изменившейся'
+        )
+        state.commit([self.HOMEWORK], 100)
+        assert state.diff([self.HOMEWORK]) == [], (
+            'Домашка с прежним статусом не должна считаться изменившейся'
+        )
+        approved = dict(self.HOMEWORK, status='approved')
+        assert state.diff([approved]) == [approved]
+        state.commit([approved], 200)
+        assert [record['status'] for record in state.history] == [
+            'reviewing', 'approved'
+        ]
+
+    def test_persisted(self, tmp_path):
+        path = str(tmp_path / 'state.json')
+        state = PollState(path)
+        state.commit([self.HOMEWORK], 100)
+        state.toggle_pause()
+
+        restored = PollState(path)
+        assert restored.current_date == 100
+        assert restored.updated_at == state.updated_at
+        assert restored.paused
+        assert restored.homeworks['hw123']['status'] == 'reviewing'
+        assert restored.diff([self.HOMEWORK]) == []
+
+    def test_history_log_error_not_fatal(self, tmp_path):
+        from history import HistoryLog
+
+        path = str(tmp_path / 'state.json')
+        log = HistoryLog(str(tmp_path / 'missing' / 'history.bin'))
+        state = PollState(path, 1, log)
+        state.commit([self.HOMEWORK], 100)
+        assert PollState(path).diff([self.HOMEWORK]) == [], (
+            'Ошибка журнала не должна мешать сохранению состояния'
+        )
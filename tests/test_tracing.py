@@ -0,0 +1,41 @@
+import json
+
+from digest import Digest
+from tracing import Tracer, otlp_spans, report
+
+
+class TestTracing:
+    HOMEWORK = {'homework_name': 'hw123', 'status': 'approved'}
+
+    def test_disabled(self):
+        assert Tracer().start(self.HOMEWORK, 100) is None
+
+    def test_trace_delivered_and_reported(self, tmp_path):
+        path = str(tmp_path / 'traces.jsonl')
+        tracer = Tracer(path)
+        trace = tracer.start(self.HOMEWORK, 100)
+        trace.span('poll_wait', 160)
+        trace.span('get_api_answer', 161)
+        digest = Digest(lambda text: None, on_delivered=tracer.export)
+        digest.add('message', trace)
+        digest.flush()
+
+        with open(path, encoding='utf-8') as file:
+            exported = json.loads(file.readline())
+        assert [span['name'] for span in exported['spans']] == [
+            'poll_wait', 'get_api_answer', 'queue', 'send_message'
+        ]
+        assert exported['spans'][0]['end'] - exported['spans'][0]['start'] == 60
+        lines = report(path).splitlines()
+        assert [line.split()[0] for line in lines] == [
+            'stage', 'poll_wait', 'get_api_answer', 'queue', 'send_message',
+            'total'
+        ]
+
+    def test_otlp_spans(self):
+        trace = Tracer('unused').start(self.HOMEWORK, 100)
+        trace.span('poll_wait', 160)
+        root, child = otlp_spans(trace)
+        assert child['parentSpanId'] == root['spanId']
+        assert root['traceId'] == child['traceId'] == trace.trace_id
+        assert child['endTimeUnixNano'] == str(160 * 10 ** 9)
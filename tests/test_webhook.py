@@ -0,0 +1,96 @@
+import json
+from http import HTTPStatus
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from webhook import SECRET_HEADER, start_webhook
+
+events = []
+
+
+def check_event(event):
+    if not isinstance(event.get('homeworks'), list):
+        raise TypeError(event)
+    events.append(event)
+
+
+@pytest.fixture
+def server():
+    events.clear()
+    server = start_webhook(0, 'secret', check_event)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body, secret='secret'):
+    request = Request(
+        'http://127.0.0.1:{}/'.format(server.server_address[1]),
+        data=body, headers={SECRET_HEADER: secret}
+    )
+    try:
+        return urlopen(request).status
+    except HTTPError as error:
+        return error.code
+
+
+class TestWebhook:
+    EVENT = {'homeworks': [{'homework_name': 'hw123', 'status': 'approved'}]}
+
+    def test_accepted(self, server):
+        assert post(server, json.dumps(self.EVENT).encode()) == (
+            HTTPStatus.ACCEPTED
+        )
+        assert events == [self.EVENT]
+
+    def test_rejected(self, server):
+        assert post(server, b'not json') == HTTPStatus.BAD_REQUEST
+        assert post(server, b'{"homeworks": {}}') == HTTPStatus.BAD_REQUEST
+        assert post(
+            server, json.dumps(self.EVENT).encode(), secret='wrong'
+        ) == HTTPStatus.FORBIDDEN
+        assert events == []
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+def test_event_reaches_chat(monkeypatch, tmp_path):
+    import homework
+
+    monkeypatch.setattr(homework, 'STATE_DIR', str(tmp_path))
+    bot = FakeBot()
+    tenants = {42: homework.Tenant(42, 'token', bot, None)}
+    server = start_webhook(
+        0, 'secret', lambda event: homework.handle_event(tenants, event)
+    )
+    try:
+        assert post(server, json.dumps(
+            dict(TestWebhook.EVENT, chat_id=42)
+        ).encode()) == HTTPStatus.ACCEPTED
+        assert post(server, b'{"homeworks": {}}') == HTTPStatus.BAD_REQUEST
+        invalid = dict(TestWebhook.EVENT['homeworks'][0],
+                       homework_name='hw2', id='x')
+        for _ in range(2):
+            assert post(server, json.dumps(
+                {'homeworks': [invalid], 'chat_id': 42}
+            ).encode()) == HTTPStatus.BAD_REQUEST
+    finally:
+        server.shutdown()
+        server.server_close()
+    tenants[42].digest.flush()
+    assert bot.sent == [(42, homework.parse_status(
+        TestWebhook.EVENT['homeworks'][0]
+    ))], 'Событие webhook должно дойти до чата студента'
+
+
+def test_secret_required():
+    with pytest.raises(ValueError):
+        start_webhook(0, '', check_event)
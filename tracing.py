@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'homework_bot'
+EXPORT_ERROR = 'Не удалось выгрузить трассировки в {target}: {error}'
+REPORT_HEADER = '{stage:<16} {count:>6} {p50:>9} {p90:>9} {max:>9}'
+REPORT_LINE = '{stage:<16} {count:>6} {p50:>9.3f} {p90:>9.3f} {max:>9.3f}'
+
+
+class Trace:
+    """Путь одного изменения статуса от date_updated до доставки.
+    Этапы идут друг за другом: каждый начинается там, где закончился
+    предыдущий, поэтому их длительности в сумме дают всю задержку.
+    """
+
+    def __init__(self, homework, started):
+        self.trace_id = os.urandom(16).hex()
+        self.homework = homework['homework_name']
+        self.status = homework['status']
+        self.started = started
+        self.mark = started
+        self.spans = []
+
+    def span(self, name, end):
+        """Этап от конца предыдущего до end."""
+        self.spans.append(dict(name=name, start=self.mark, end=end))
+        self.mark = max(self.mark, end)
+
+    def as_dict(self):
+        """Трассировка для записи в JSON."""
+        return dict(
+            trace_id=self.trace_id, homework=self.homework,
+            status=self.status, spans=self.spans
+        )
+
+
+def otlp_time(timestamp):
+    """Время в наносекундах строкой, как требует OTLP/JSON."""
+    return str(int(timestamp * 1e9))
+
+
+def otlp_spans(trace):
+    """Корневой спан трассировки и спаны её этапов в формате OTLP."""
+    root_id = os.urandom(8).hex()
+    attributes = [
+        dict(key='homework.name', value=dict(stringValue=trace.homework)),
+        dict(key='homework.status', value=dict(stringValue=trace.status)),
+    ]
+    spans = [dict(
+        traceId=trace.trace_id, spanId=root_id, name='notification',
+        kind=1, startTimeUnixNano=otlp_time(trace.started),
+        endTimeUnixNano=otlp_time(trace.mark), attributes=attributes,
+    )]
+    for span in trace.spans:
+        spans.append(dict(
+            traceId=trace.trace_id, spanId=os.urandom(8).hex(),
+            parentSpanId=root_id, name=span['name'], kind=1,
+            startTimeUnixNano=otlp_time(span['start']),
+            endTimeUnixNano=otlp_time(span['end']),
+        ))
+    return spans
+
+
+class Tracer:
+    """Выгрузка трассировок в файл JSON Lines и/или OTLP/HTTP коллектор."""
+
+    def __init__(self, path=None, otlp_endpoint=None):
+        self.path = path
+        self.otlp_endpoint = otlp_endpoint
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Включена ли трассировка."""
+        return bool(self.path or self.otlp_endpoint)
+
+    def start(self, homework, started):
+        """Новая трассировка или None, если трассировка выключена."""
+        if not self.enabled:
+            return None
+        return Trace(homework, started)
+
+    def export(self, traces):
+        """Выгрузка доставленных трассировок; ошибки только в журнал."""
+        if not traces:
+            return
+        if self.path:
+            try:
+                with self.lock, open(self.path, 'a', encoding='utf-8') as file:
+                    for trace in traces:
+                        file.write(json.dumps(
+                            trace.as_dict(), ensure_ascii=False
+                        ) + '\n')
+            except OSError as error:
+                logger.warning(EXPORT_ERROR.format(
+                    target=self.path, error=error
+                ))
+        if self.otlp_endpoint:
+            self.export_otlp(traces)
+
+    def export_otlp(self, traces):
+        """Отправка трассировок в коллектор по OTLP/HTTP (JSON)."""
+        import requests
+
+        body = dict(resourceSpans=[dict(
+            resource=dict(attributes=[dict(
+                key='service.name', value=dict(stringValue=SERVICE_NAME)
+            )]),
+            scopeSpans=[dict(
+                scope=dict(name=SERVICE_NAME),
+                spans=[span for trace in traces for span in otlp_spans(trace)]
+            )],
+        )])
+        try:
+            requests.post(self.otlp_endpoint, json=body, timeout=5)
+        except requests.exceptions.RequestException as error:
+            logger.warning(EXPORT_ERROR.format(
+                target=self.otlp_endpoint, error=error
+            ))
+
+
+def percentile(values, share):
+    """Перцентиль по отсортированному списку."""
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def report(path):
+    """Разбивка задержки уведомлений по этапам, в секундах."""
+    stages = {}
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            spans = json.loads(line)['spans']
+            for span in spans:
+                stages.setdefault(span['name'], []).append(
+                    span['end'] - span['start']
+                )
+            if spans:
+                stages.setdefault('total', []).append(
+                    spans[-1]['end'] - spans[0]['start']
+                )
+    lines = [REPORT_HEADER.format(
+        stage='stage', count='count', p50='p50', p90='p90', max='max'
+    )]
+    for stage, durations in stages.items():
+        durations.sort()
+        lines.append(REPORT_LINE.format(
+            stage=stage, count=len(durations),
+            p50=percentile(durations, 0.5),
+            p90=percentile(durations, 0.9), max=durations[-1]
+        ))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    print(report(sys.argv[1]))
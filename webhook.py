@@ -0,0 +1,65 @@
+import hmac
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'X-Webhook-Token'
+DEFAULT_HOST = '127.0.0.1'
+MAX_BODY_SIZE = 64 * 1024
+EVENT_REJECTED = 'Событие отклонено: {error}'
+EVENT_FAILED = 'Сбой обработки события: {error}'
+WEBHOOK_STARTED = 'Приём событий запущен на {host}:{port}'
+SECRET_MISSING = 'Приём событий без секрета не запускается'
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Приём событий об изменении статусов домашек."""
+
+    def do_POST(self):
+        """Событие в формате ответа API: {"homeworks": [...]}."""
+        if not hmac.compare_digest(
+            self.headers.get(SECRET_HEADER, ''), self.server.secret
+        ):
+            return self.reply(HTTPStatus.FORBIDDEN)
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if not 0 < length <= MAX_BODY_SIZE:
+                raise ValueError(length)
+            self.server.on_event(json.loads(self.rfile.read(length)))
+        except (TypeError, KeyError, ValueError) as error:
+            logger.warning(EVENT_REJECTED.format(error=error))
+            return self.reply(HTTPStatus.BAD_REQUEST)
+        except Exception as error:
+            logger.error(EVENT_FAILED.format(error=error))
+            return self.reply(HTTPStatus.INTERNAL_SERVER_ERROR)
+        return self.reply(HTTPStatus.ACCEPTED)
+
+    def reply(self, status):
+        """Пустой ответ с кодом статуса."""
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Журнал запросов через logging вместо stderr."""
+        logger.debug(format, *args)
+
+
+def start_webhook(port, secret, on_event, host=DEFAULT_HOST):
+    """Запуск приёма событий в фоновом потоке.
+    on_event получает разобранный JSON события и выбрасывает
+    TypeError/KeyError/ValueError, если событие некорректно.
+    Без secret приём не запускается (ValueError).
+    """
+    if not secret:
+        raise ValueError(SECRET_MISSING)
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    server.secret = secret
+    server.on_event = on_event
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(WEBHOOK_STARTED.format(host=host, port=port))
+    return server